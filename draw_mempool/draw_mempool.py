@@ -1,18 +1,15 @@
 #!/usr/bin/env python3
 import argparse
-import copy
+import bisect
+import contextlib
 import decimal
 import json
 import math
-import networkx as nx
 import os
 import subprocess
 import sys
 import time
-import matplotlib.patches as mpatches
-from matplotlib import pyplot as plt
-from matplotlib.ticker import StrMethodFormatter
-from networkx.drawing.nx_agraph import graphviz_layout
+from draw_mempool.graph import TxGraph
 from draw_mempool.rpc import NodeCLI
 
 
@@ -31,6 +28,9 @@ build_tx_package_func = None
 # Going to set later
 rpc = None
 
+# Feerate bucket boundaries in Sat/Byte for --stats
+STATS_FEERATE_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
 
 # Set which function to use when building dependency graphs.
 # New clients have PR #12479, and are more efficient
@@ -113,6 +113,14 @@ def get_tx_fee(txinfo):
     return txinfo['fee']*COIN
 
 
+# Virtual size in bytes if available
+def get_tx_size(txinfo):
+    try:
+        return txinfo['vsize']
+    except KeyError:
+        return txinfo['size']
+
+
 # In Sat/Byte
 def get_tx_feerate(txinfo):
     try:
@@ -162,6 +170,13 @@ def add_to_graph(G, mempoolinfo, tx):
 
 # Draw just the transaction relations in nice spatial representation
 def draw_txs_simple(G, mempoolinfo):
+    import networkx as nx
+    from matplotlib import pyplot as plt
+    from networkx.drawing.nx_agraph import graphviz_layout
+
+    # graphviz needs a real networkx graph
+    G = G.to_networkx()
+
     # positions for all nodes
     pos = graphviz_layout(G, prog='dot')
     fees = [get_tx_feerate(mempoolinfo[tx]) for tx in G]
@@ -184,6 +199,9 @@ def follow_link(tx):
 
 # Animate!
 def animate_graph(G, mempoolinfo, args, title=None):
+    from matplotlib import pyplot as plt
+    from matplotlib.ticker import StrMethodFormatter
+
     # First exec needs to show()
     plt.ion()
     fig, ax = plt.gcf(), plt.gca()
@@ -273,12 +291,15 @@ def setup_events(G, mempoolinfo, args, fig, ax):
 
 
 def setup_fig():
+    from matplotlib import pyplot as plt
     fig, ax = plt.subplots(1)
     fig.set_size_inches(12, 8, forward=True)
     return fig, ax
 
 
 def draw_mempool_graph(G, mempoolinfo, args, title=None, draw_labels=False, preserve_scale=False):
+    from matplotlib import pyplot as plt
+    from matplotlib.ticker import StrMethodFormatter
 
     if preserve_scale:
         old_ylim = plt.gca().get_ylim()
@@ -303,6 +324,7 @@ def draw_mempool_graph(G, mempoolinfo, args, title=None, draw_labels=False, pres
 
 # Color nodes based on kind of tx (RBF, CPFP, etc.)
 def get_nodecolors(G, mempoolinfo, args, plt):
+    import matplotlib.patches as mpatches
     handles, rbf_txs, blocktemplatetxs, cpfp_txs = [], [], [], []
     highlight = args.hltxs if args.hltxs else []
     if args.color_rbf:
@@ -332,6 +354,9 @@ def get_nodecolors(G, mempoolinfo, args, plt):
 
 
 def draw_on_graph(G, mempoolinfo, args, ax, fig, title=None, draw_labels=False):
+    import networkx as nx
+    from matplotlib import pyplot as plt
+    from draw_mempool.edges import draw_edges
 
     tx_fees = {tx: get_tx_feerate(mempoolinfo[tx]) for tx in G}
     min_fee, max_fee = min(tx_fees.values()), max(tx_fees.values())
@@ -373,8 +398,8 @@ def draw_on_graph(G, mempoolinfo, args, ax, fig, title=None, draw_labels=False):
     G.position = {tx: (tx_ages[tx], tx_fees[tx]) for tx in G}
 
     pos = G.position
-    nx.draw_networkx_nodes(G, pos, alpha=alpha, node_color=nodecolors, node_size=nodesize, label='trans')
-    nx.draw_networkx_edges(G, pos, alpha=0.15, arrowsize=15, label='spends')
+    nx.draw_networkx_nodes(G, pos, nodelist=list(G), alpha=alpha, node_color=nodecolors, node_size=nodesize, label='trans')
+    draw_edges(plt.gca(), G, pos, node_size=nodesize, alpha=0.15, arrowsize=15, label='spends')
 
     if draw_labels:
         nx.draw_networkx_labels(G, pos, labels=nodelabels, font_size=4)
@@ -429,7 +454,7 @@ def tx_filter(tx_info,
 
 def make_mempool_graph(mempoolinfo, only_txs=None, txlimit=15000, **kwargs):
 
-    G = nx.DiGraph()
+    G = TxGraph()
     added = 0
 
     if only_txs:
@@ -438,12 +463,13 @@ def make_mempool_graph(mempoolinfo, only_txs=None, txlimit=15000, **kwargs):
             seen = add_to_graph(G, mempoolinfo, tx)
             added += len(seen)
     else:
-        mempoolinfo_cp = copy.deepcopy(mempoolinfo)
-        while added < txlimit:
-            try:
-                tx = next(iter(mempoolinfo_cp))
-            except StopIteration:
+        # Txs already pulled in with an earlier package
+        consumed = set()
+        for tx in mempoolinfo:
+            if added >= txlimit:
                 break
+            if tx in consumed:
+                continue
             try:
                 should_add = tx_filter(mempoolinfo[tx], **kwargs)
             except Exception:
@@ -453,11 +479,8 @@ def make_mempool_graph(mempoolinfo, only_txs=None, txlimit=15000, **kwargs):
                 # Will pull in all related ancestor/descendant transcations
                 seen = add_to_graph(G, mempoolinfo, tx)
                 added += len(seen)
-                # Remove these from our mempool copy so we don't duplicate
-                for tx in seen:
-                    mempoolinfo_cp.pop(tx, None)
-            else:
-                mempoolinfo_cp.pop(tx, None)
+                # Skip these later so we don't duplicate
+                consumed.update(seen)
 
     print("Filtered down to %s txs" % len(G))
     return G if added else None
@@ -509,6 +532,81 @@ def test_bt():
     print("Got weight: %s | txs: %s | fees: %s | sigops: %s" % (weight, len(txs), fee, sigops))
 
 
+# Summarize txs passing tx_filter, without drawing anything. Only asks
+# the node for getblocktemplate if use_node, a snapshot would not match it.
+def get_mempool_stats(mempoolinfo, use_node=True, **kwargs):
+    txs = []
+    for tx, txinfo in mempoolinfo.items():
+        try:
+            should_add = tx_filter(txinfo, **kwargs)
+        except Exception:
+            # Only breaks in test mode
+            should_add = True
+        if should_add:
+            txs.append(tx)
+
+    bounds = [0] + STATS_FEERATE_BUCKETS
+    buckets = [{'minfeerate': low, 'maxfeerate': high, 'count': 0, 'vsize': 0}
+               for low, high in zip(bounds, STATS_FEERATE_BUCKETS + [None])]
+    for tx in txs:
+        bucket = buckets[bisect.bisect_right(STATS_FEERATE_BUCKETS, get_tx_feerate(mempoolinfo[tx]))]
+        bucket['count'] += 1
+        bucket['vsize'] += get_tx_size(mempoolinfo[tx])
+
+    # Without bip125-replaceable this takes one getrawtransaction per tx,
+    # too slow for a summary, so leave it unknown
+    if mempoolinfo and 'bip125-replaceable' in next(iter(mempoolinfo.values())):
+        rbf_count = len([tx for tx in txs if mempoolinfo[tx]['bip125-replaceable']])
+    else:
+        rbf_count = None
+
+    try:
+        bt_txs = get_bt_txs() if use_node else None
+    except Exception:
+        # Node is not reachable
+        bt_txs = None
+    if bt_txs is None:
+        blocktemplate = None
+    else:
+        overlap = [tx for tx in txs if tx in bt_txs]
+        blocktemplate = {
+            'txs': len(bt_txs),
+            'overlap_txs': len(overlap),
+            'overlap_vsize': sum(get_tx_size(mempoolinfo[tx]) for tx in overlap),
+        }
+
+    return {
+        'mempool_txs': len(mempoolinfo),
+        'txs': len(txs),
+        'vsize': sum(get_tx_size(mempoolinfo[tx]) for tx in txs),
+        'fee': float(sum(mempoolinfo[tx]['fee'] for tx in txs)),
+        'feerate_buckets': buckets,
+        'cpfp_txs': len(get_cpfp_txs({tx: mempoolinfo[tx] for tx in txs})),
+        'rbf_txs': rbf_count,
+        'blocktemplate': blocktemplate,
+    }
+
+
+def print_mempool_stats(stats):
+    print("Mempool txs   : %s" % stats['mempool_txs'])
+    print("Filtered txs  : %s" % stats['txs'])
+    print("VSize         : %s" % stats['vsize'])
+    print("Fee           : %s" % stats['fee'])
+    print("CPFP txs      : %s" % stats['cpfp_txs'])
+    print("RBF txs       : %s" % ('unknown' if stats['rbf_txs'] is None else stats['rbf_txs']))
+    bt = stats['blocktemplate']
+    if bt:
+        print("In template   : %s txs, %s vbytes (template has %s txs)" %
+              (bt['overlap_txs'], bt['overlap_vsize'], bt['txs']))
+    print("\nFeeRate (Sat/Byte)    Txs       VSize")
+    for bucket in stats['feerate_buckets']:
+        if bucket['maxfeerate'] is None:
+            feerange = "%s+" % bucket['minfeerate']
+        else:
+            feerange = "%s-%s" % (bucket['minfeerate'], bucket['maxfeerate'])
+        print("%-18s %6s %11s" % (feerange, bucket['count'], bucket['vsize']))
+
+
 def get_mempool():
     return rpc.getrawmempool('true')
 
@@ -553,6 +651,10 @@ def main():
     parser.add_argument('--color_bt', action='store_true', help='Color getblocktemplate txs different')
     parser.add_argument('--color_rbf', action='store_true', help='Color txs eligible for replace-by-fee different.')
     parser.add_argument('--color_cpfp', action='store_true', help='Color txs eligible for "Child Pays for Parent" (CPFP).')
+    parser.add_argument('--stats', nargs='?', const='text', choices=['text', 'json'],
+                        help='Print summary of filtered txs instead of drawing (text or json).\n'
+                             'RBF count is null without the bip125-replaceable field, and\n'
+                             'getblocktemplate overlap is null with --snapshot')
     parser.add_argument('--snapshot', help='Specify json file of mempool snapshot')
     parser.add_argument('--txs', action='append', help='Specific tx to draw, can list multiple')
     parser.add_argument('--hltxs', action='append', help='Specific transaction to highlight, can list multiple')
@@ -595,6 +697,20 @@ def main():
     else:
         mempoolinfo = get_mempool()
 
+    if args.stats:
+        # Keep stdout parseable, diagnostics go to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            stats = get_mempool_stats(mempoolinfo, use_node=not args.snapshot, **filter_options)
+        if args.stats == 'json':
+            print(json.dumps(stats, indent=2))
+        else:
+            print_mempool_stats(stats)
+        sys.exit(0)
+
+    if not mempoolinfo:
+        print("Mempool is empty, nothing to draw")
+        sys.exit(0)
+
     set_build_tx_package_func(mempoolinfo)
     try:
         G = make_mempool_graph(mempoolinfo, only_txs=args.hltxs, txlimit=args.txlimit, **filter_options)
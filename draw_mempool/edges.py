@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.transforms import IdentityTransform
+
+"""
+Draw every tx dependency edge with two collections instead of one
+FancyArrowPatch per edge, so drawing time hardly depends on edge count.
+
+Both edge lines and arrowheads are laid out in display space each time
+they are drawn. That keeps them pointing the right way and trimmed to
+the node edges on log scaled or inverted axes and after zooming.
+"""
+
+
+# Edge ends in display space, pulled back from both node centers by
+# the node radius, plus the unit direction of each edge
+def display_edge_ends(axes, renderer, tails, heads, shrink_tail, shrink_head):
+    trans = axes.transData
+    tails = trans.transform(tails)
+    heads = trans.transform(heads)
+
+    direction = heads - tails
+    length = np.hypot(direction[:, 0], direction[:, 1])
+    length[length == 0] = 1.0
+    direction /= length[:, np.newaxis]
+
+    pixels = renderer.points_to_pixels(1.0)
+    starts = tails + direction * (shrink_tail * pixels)[:, np.newaxis]
+    ends = heads - direction * (shrink_head * pixels)[:, np.newaxis]
+    return starts, ends, direction, pixels
+
+
+class EdgeLineCollection(LineCollection):
+    """One line per edge, from the tail node edge to the arrowhead base"""
+
+    def __init__(self, tails, heads, shrink_tail, shrink_head, arrowsize, **kwargs):
+        super().__init__([], transform=IdentityTransform(), **kwargs)
+        self._tails = tails
+        self._heads = heads
+        # In points, pull the ends back to the edge of the nodes
+        self._shrink_tail = shrink_tail
+        self._shrink_head = shrink_head
+        # Stop where the arrowhead starts
+        self._head_length = 0.4 * arrowsize
+
+    def draw(self, renderer):
+        starts, ends, direction, pixels = display_edge_ends(
+            self.axes, renderer, self._tails, self._heads, self._shrink_tail, self._shrink_head)
+        ends = ends - direction * (self._head_length * pixels)
+        self.set_segments(np.stack([starts, ends], axis=1))
+        super().draw(renderer)
+
+
+class ArrowHeadCollection(PolyCollection):
+    """One triangle per edge, pointing from tail to head"""
+
+    def __init__(self, tails, heads, shrink_tail, shrink_head, arrowsize, **kwargs):
+        super().__init__([], transform=IdentityTransform(), **kwargs)
+        self._tails = tails
+        self._heads = heads
+        # In points, the tip stops at the edge of the head node
+        self._shrink_tail = shrink_tail
+        self._shrink_head = shrink_head
+        # Same meaning as networkx arrowsize (the '-|>' mutation scale)
+        self._head_length = 0.4 * arrowsize
+        self._head_width = 0.2 * arrowsize
+
+    def draw(self, renderer):
+        starts, tips, direction, pixels = display_edge_ends(
+            self.axes, renderer, self._tails, self._heads, self._shrink_tail, self._shrink_head)
+        bases = tips - direction * (self._head_length * pixels)
+        normal = np.column_stack([-direction[:, 1], direction[:, 0]]) * (self._head_width * pixels)
+
+        self.set_verts(np.stack([tips, bases + normal, bases - normal], axis=1))
+        super().draw(renderer)
+
+
+# Like nx.draw_networkx_edges, node_size is either a scalar or a
+# list in the same order as iterating G
+def draw_edges(ax, G, pos, node_size=300, color='k', alpha=None, width=1.0, arrowsize=10, label=None):
+    edges = G.edges()
+    if not edges:
+        return None
+
+    tails = np.array([pos[u] for u, v in edges], dtype=float)
+    heads = np.array([pos[v] for u, v in edges], dtype=float)
+
+    # Node size is an area in points^2
+    if np.iterable(node_size):
+        sizes = dict(zip(G, node_size))
+        shrink_tail = np.sqrt([sizes[u] for u, v in edges]) / 2.0
+        shrink_head = np.sqrt([sizes[v] for u, v in edges]) / 2.0
+    else:
+        shrink_tail = shrink_head = np.full(len(edges), np.sqrt(node_size) / 2.0)
+
+    lines = EdgeLineCollection(tails, heads, shrink_tail, shrink_head, arrowsize,
+                               colors=color, linewidths=width, alpha=alpha, label=label, zorder=1)
+    ax.add_collection(lines, autolim=False)
+
+    arrows = ArrowHeadCollection(tails, heads, shrink_tail, shrink_head, arrowsize,
+                                 facecolors=color, edgecolors='none', alpha=alpha, zorder=1)
+    ax.add_collection(arrows, autolim=False)
+
+    return lines, arrows
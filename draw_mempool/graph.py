@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+from array import array
+
+"""
+A compact directed graph for mempool transactions.
+
+Nodes are mapped to integer ids and edges are kept in flat arrays,
+with child adjacency built on demand in CSR (compressed sparse row)
+form with numpy. Removed nodes are tombstoned, their edges are masked
+out of the CSR, and ids are only renumbered once enough tombstones pile
+up, which keeps animation updates cheap. numpy is only imported once
+adjacency is needed.
+
+Only what draw_mempool needs from networkx is implemented here; use
+to_networkx() when a real networkx graph is required (e.g. graphviz).
+"""
+
+# Compact once this fraction of node ids are tombstones
+COMPACT_RATIO = 0.25
+
+# But don't bother compacting tiny graphs
+COMPACT_MIN_NODES = 1024
+
+
+class TxGraph():
+    """Directed graph of txids backed by integer ids and CSR arrays"""
+
+    def __init__(self):
+        # txid -> id, only for live nodes
+        self._ids = {}
+        # id -> txid, including tombstones
+        self._txids = []
+        # id -> 1 if live, 0 if tombstoned
+        self._alive = bytearray()
+        self._ndead = 0
+        # Edges in insertion order, may contain dead ends and duplicates
+        self._src = array('i')
+        self._dst = array('i')
+        # (child_offsets, child_ids)
+        self._csr = None
+        # Drawing code stores node positions here
+        self.position = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __bool__(self):
+        return bool(self._ids)
+
+    def __contains__(self, tx):
+        return tx in self._ids
+
+    def __iter__(self):
+        txids, alive = self._txids, self._alive
+        return (txids[i] for i in range(len(txids)) if alive[i])
+
+    def add_node(self, tx):
+        try:
+            return self._ids[tx]
+        except KeyError:
+            pass
+        i = len(self._txids)
+        self._ids[tx] = i
+        self._txids.append(tx)
+        self._alive.append(1)
+        return i
+
+    def add_edge(self, u, v):
+        self._src.append(self.add_node(u))
+        self._dst.append(self.add_node(v))
+        self._csr = None
+
+    def remove_node(self, tx):
+        # Re-adding tx later gets a fresh id, so edges to the
+        # tombstone never come back to life
+        i = self._ids.pop(tx)
+        self._alive[i] = 0
+        self._ndead += 1
+        self._csr = None
+        if (len(self._txids) >= COMPACT_MIN_NODES and
+                self._ndead > COMPACT_RATIO * len(self._txids)):
+            self.compact()
+
+    def compact(self):
+        """Drop tombstones and their edges, renumbering live nodes"""
+        import numpy as np
+        alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+        remap = np.cumsum(alive, dtype=np.intc) - 1
+        remap[~alive] = -1
+
+        src = remap[np.frombuffer(self._src, dtype=np.intc)]
+        dst = remap[np.frombuffer(self._dst, dtype=np.intc)]
+        keep = (src >= 0) & (dst >= 0)
+
+        self._txids = [tx for tx, live in zip(self._txids, self._alive) if live]
+        self._ids = {tx: i for i, tx in enumerate(self._txids)}
+        self._alive = bytearray(b'\x01') * len(self._txids)
+        self._ndead = 0
+        self._src = _to_array(src[keep])
+        self._dst = _to_array(dst[keep])
+        self._csr = None
+
+    def _build_csr(self):
+        if self._csr is None:
+            import numpy as np
+            n = len(self._txids)
+            src = np.frombuffer(self._src, dtype=np.intc)
+            dst = np.frombuffer(self._dst, dtype=np.intc)
+
+            # Mask out edges touching tombstones, ids stay as they are
+            alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+            live = alive[src] & alive[dst]
+
+            # Drop duplicate edges, keeping the first of each in insertion order
+            first = np.unique(src[live].astype(np.int64) * n + dst[live], return_index=True)[1]
+            first.sort()
+            keep = np.flatnonzero(live)[first]
+
+            # Tombstone ids are never reused, so dropped edges are gone for good
+            if len(keep) < len(src):
+                src, dst = src[keep], dst[keep]
+                self._src, self._dst = _to_array(src), _to_array(dst)
+
+            self._csr = _csr_index(n, src, dst)
+        return self._csr
+
+    def edges(self):
+        import numpy as np
+        offsets, ids = self._build_csr()
+        txids = self._txids
+        src = np.repeat(np.arange(len(txids)), np.diff(offsets))
+        return [(txids[u], txids[v]) for u, v in zip(src.tolist(), ids.tolist())]
+
+    def to_networkx(self):
+        import networkx as nx
+        G = nx.DiGraph()
+        G.add_nodes_from(self)
+        G.add_edges_from(self.edges())
+        return G
+
+
+# Back to a growable array('i'), which shares its layout with np.intc
+def _to_array(values):
+    import numpy as np
+    edges = array('i')
+    edges.frombytes(np.ascontiguousarray(values, dtype=np.intc).tobytes())
+    return edges
+
+
+# Stable sort of (src, dst) pairs by src into CSR offsets and neighbor ids,
+# so each row keeps edge insertion order
+def _csr_index(n, src, dst):
+    import numpy as np
+    offsets = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+    ids = dst[np.argsort(src, kind='mergesort')]
+    return offsets, ids
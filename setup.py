@@ -31,6 +31,7 @@ setup(
     python_requires='>=3.4',
     install_requires=[
         'matplotlib==2.1.2',
+        'numpy==1.14.0',
         'networkx==2.1',
     ],
     entry_points={
@@ -0,0 +1,86 @@
+from draw_mempool import graph
+from draw_mempool.graph import TxGraph
+
+
+def make_graph(edges):
+    G = TxGraph()
+    for u, v in edges:
+        G.add_edge(u, v)
+    return G
+
+
+def test_add_nodes_and_edges():
+    G = make_graph([('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd')])
+    G.add_node('e')
+    assert list(G) == ['a', 'b', 'c', 'd', 'e']
+    assert len(G) == 5
+    assert 'e' in G and 'f' not in G
+    assert G.edges() == [('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd')]
+
+
+def test_edges_grouped_by_source_in_insertion_order():
+    G = make_graph([('a', 'c'), ('b', 'a'), ('a', 'b'), ('b', 'c')])
+    assert G.edges() == [('a', 'c'), ('a', 'b'), ('b', 'a'), ('b', 'c')]
+
+
+def test_duplicate_edges_keep_first():
+    G = make_graph([('a', 'c'), ('a', 'b'), ('a', 'c'), ('a', 'b')])
+    assert G.edges() == [('a', 'c'), ('a', 'b')]
+    # Still deduplicated after more edges come in
+    G.add_edge('a', 'c')
+    G.add_edge('a', 'd')
+    assert G.edges() == [('a', 'c'), ('a', 'b'), ('a', 'd')]
+
+
+def test_remove_node_drops_its_edges():
+    G = make_graph([('a', 'b'), ('b', 'c'), ('a', 'c')])
+    G.edges()
+    G.remove_node('b')
+    assert list(G) == ['a', 'c']
+    assert 'b' not in G
+    assert G.edges() == [('a', 'c')]
+    # Below the threshold the tombstone is masked, not compacted
+    assert G._ndead == 1
+
+
+def test_readded_node_does_not_revive_old_edges():
+    G = make_graph([('a', 'b'), ('b', 'c')])
+    G.remove_node('b')
+    G.add_edge('b', 'd')
+    assert list(G) == ['a', 'c', 'b', 'd']
+    assert G.edges() == [('b', 'd')]
+
+
+def test_remove_missing_node_raises():
+    G = make_graph([('a', 'b')])
+    try:
+        G.remove_node('z')
+    except KeyError:
+        pass
+    else:
+        assert False
+
+
+def test_compact_at_threshold(monkeypatch):
+    monkeypatch.setattr(graph, 'COMPACT_MIN_NODES', 4)
+    G = make_graph([('a', 'b'), ('c', 'd'), ('a', 'd'), ('c', 'a')])
+    G.remove_node('b')
+    assert G._ndead == 1
+    G.remove_node('d')
+    # 2 of 4 ids dead is over COMPACT_RATIO, ids get renumbered
+    assert G._ndead == 0
+    assert G._txids == ['a', 'c']
+    assert list(G) == ['a', 'c']
+    assert G.edges() == [('c', 'a')]
+    G.add_edge('a', 'e')
+    assert G.edges() == [('a', 'e'), ('c', 'a')]
+
+
+def test_empty_graph():
+    G = TxGraph()
+    assert not G
+    assert G.edges() == []
+    G.add_node('a')
+    G.remove_node('a')
+    assert not G
+    assert G.edges() == []